@@ -14,38 +14,46 @@ if TYPE_CHECKING:
 
 
 ###### Basic Arithmetic
+## int op int is by far the most common case, so it is checked for before doing any coercion
 
 @ophandler_typed(Operator.Add, Operand.Number, Operand.Number)
 def operator_add(ctx, a, b) -> Iterable[ScriptValue]:
+    if type(a) is IntValue and type(b) is IntValue:
+        return [IntValue.get_value(a.value + b.value)]
     rtype = coerce_number(a, b)
-    yield rtype(a.value + b.value)
+    return [rtype.get_value(a.value + b.value)]
 
 @ophandler_typed(Operator.Sub, Operand.Number, Operand.Number)
 def operator_sub(ctx, a, b) -> Iterable[ScriptValue]:
+    if type(a) is IntValue and type(b) is IntValue:
+        return [IntValue.get_value(a.value - b.value)]
     rtype = coerce_number(a, b)
-    yield rtype(a.value - b.value)
+    return [rtype.get_value(a.value - b.value)]
 
 @ophandler_typed(Operator.Mul, Operand.Number, Operand.Number)
 def operator_mul(ctx, a, b) -> Iterable[ScriptValue]:
+    if type(a) is IntValue and type(b) is IntValue:
+        return [IntValue.get_value(a.value * b.value)]
     rtype = coerce_number(a, b)
-    yield rtype(a.value * b.value)
+    return [rtype.get_value(a.value * b.value)]
 
 @ophandler_typed(Operator.Div, Operand.Number, Operand.Number)
 def operator_div(ctx, a, b) -> Iterable[ScriptValue]:
+    if type(a) is IntValue and type(b) is IntValue:
+        return [IntValue.get_value(a.value / b.value)]
     rtype = coerce_number(a, b)
-    yield rtype(a.value / b.value)
+    return [rtype.get_value(a.value / b.value)]
 
 @ophandler_typed(Operator.Pow, Operand.Number, Operand.Number)
 def operator_pow(ctx, a, b) -> Iterable[ScriptValue]:
+    if type(a) is IntValue and type(b) is IntValue:
+        return [IntValue.get_value(a.value ** b.value)]
     rtype = coerce_number(a, b)
-    yield rtype(a.value ** b.value)
+    return [rtype.get_value(a.value ** b.value)]
 
-@ophandler_typed(Operator.Mod, Operand.Number, Operand.Number)
+@ophandler_typed(Operator.Mod, Operand.Int, Operand.Int)
 def operator_mod(ctx, a, b) -> Iterable[ScriptValue]:
-    if not isinstance(a, IntValue) or not isinstance(b, IntValue):
-        raise ScriptOperandError("unsupported operand types", a, b)
-    rtype = coerce_number(a, b)
-    yield rtype(a.value % b.value)
+    return [IntValue.get_value(a.value % b.value)]
 
 ###### Numeric Comparison
 
@@ -53,61 +61,69 @@ def operator_mod(ctx, a, b) -> Iterable[ScriptValue]:
 
 @ophandler_typed(Operator.Equal, Operand.Number, Operand.Number)
 def operator_equal(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(_test_numeric_equality(a, b))
+    return [BoolValue.get_value(_test_numeric_equality(a, b))]
 
 @ophandler_typed(Operator.NE, Operand.Number, Operand.Number)
 def operator_ne(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(not _test_numeric_equality(a, b))
+    return [BoolValue.get_value(not _test_numeric_equality(a, b))]
+
+# floats are considered equal if they are closer than this
+_FLOAT_TOLERANCE = 1e-9
 
 def _test_numeric_equality(a: DataValue, b: DataValue):
-    rtype = coerce_number(a, b)
-    if rtype == IntValue:
+    if type(a) is IntValue and type(b) is IntValue:
         return a.value == b.value
-    return abs(a.value - b.value) < 10**-9
+    # at least one of the operands is a float
+    return abs(a.value - b.value) < _FLOAT_TOLERANCE
 
 ## Inequalities
+## compare the underlying numbers directly, rather than going through the IntValue/FloatValue comparison methods
 
 @ophandler_typed(Operator.LT, Operand.Number, Operand.Number)
 def operator_lt(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a < b)
+    return [BoolValue.get_value(a.value < b.value)]
 
 @ophandler_typed(Operator.LE, Operand.Number, Operand.Number)
 def operator_le(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a <= b)
+    return [BoolValue.get_value(a.value <= b.value)]
 
 @ophandler_typed(Operator.GT, Operand.Number, Operand.Number)
 def operator_gt(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a > b)
+    return [BoolValue.get_value(a.value > b.value)]
 
 @ophandler_typed(Operator.GE, Operand.Number, Operand.Number)
 def operator_ge(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a >= b)
+    return [BoolValue.get_value(a.value >= b.value)]
 
 
 ###### Bitwise Operations
 
 # bitwise not
-@ophandler_typed(Operator.Invert, Operand.Number)
+@ophandler_typed(Operator.Invert, Operand.Int)
 def operator_invert(ctx, a) -> Iterable[ScriptValue]:
-    if not isinstance(a, IntValue):
-        raise ScriptOperandError('unsupported operand type', a)
-    yield IntValue(~a.value)
+    return [IntValue.get_value(~a.value)]
+
+@ophandler_typed(Operator.Invert, Operand.Number)
+def operator_invert_unsupported(ctx, a) -> Iterable[ScriptValue]:
+    raise ScriptOperandError('unsupported operand type', a)
 
 # bitwise and, or, xor
-@ophandler_typed(Operator.BitAnd, Operand.Number, Operand.Number)
+@ophandler_typed(Operator.BitAnd, Operand.Int, Operand.Int)
 def operator_bitand(ctx, a, b) -> Iterable[ScriptValue]:
-    if not isinstance(a, IntValue) or not isinstance(b, IntValue):
-        raise ScriptOperandError("unsupported operand types", a, b)
-    yield IntValue(a.value & b.value)
+    return [IntValue.get_value(a.value & b.value)]
 
-@ophandler_typed(Operator.BitOr, Operand.Number, Operand.Number)
+@ophandler_typed(Operator.BitOr, Operand.Int, Operand.Int)
 def operator_bitor(ctx, a, b) -> Iterable[ScriptValue]:
-    if not isinstance(a, IntValue) or not isinstance(b, IntValue):
-        raise ScriptOperandError("unsupported operand types", a, b)
-    yield IntValue(a.value | b.value)
+    return [IntValue.get_value(a.value | b.value)]
 
-@ophandler_typed(Operator.BitXor, Operand.Number, Operand.Number)
+@ophandler_typed(Operator.BitXor, Operand.Int, Operand.Int)
 def operator_bitxor(ctx, a, b) -> Iterable[ScriptValue]:
-    if not isinstance(a, IntValue) or not isinstance(b, IntValue):
-        raise ScriptOperandError("unsupported operand types", a, b)
-    yield IntValue(a.value ^ b.value)
\ No newline at end of file
+    return [IntValue.get_value(a.value ^ b.value)]
+
+# the int-only operators, for any Numbers that are not both Ints
+@ophandler_typed(Operator.Mod, Operand.Number, Operand.Number)
+@ophandler_typed(Operator.BitAnd, Operand.Number, Operand.Number)
+@ophandler_typed(Operator.BitOr, Operand.Number, Operand.Number)
+@ophandler_typed(Operator.BitXor, Operand.Number, Operand.Number)
+def operator_int_unsupported(ctx, a, b) -> Iterable[ScriptValue]:
+    raise ScriptOperandError("unsupported operand types", a, b)
\ No newline at end of file
@@ -5,7 +5,7 @@ from stackscript.values import IntValue, FloatValue, ArrayValue, TupleValue
 from stackscript.operators.defines import Operand
 
 if TYPE_CHECKING:
-    from typing import Any, Union, Type
+    from typing import Any, Union, Type, Sequence, Mapping, Tuple
     from stackscript.values import ScriptValue
 
 
@@ -24,8 +24,30 @@ def coerce_operands(optype: Operand, *operands: ScriptValue) -> Any:
     raise ValueError(f'incorrect operands for optype {optype}: ' + msg)
 
 
-def coerce_array(*operands: ScriptValue) -> Union[Type[ArrayValue], Type[TupleValue]]:
-    return coerce_operands(Operand.Array, *operands)
-
-def coerce_number(*operands: ScriptValue) -> Union[Type[IntValue], Type[FloatValue]]:
-    return coerce_operands(Operand.Number, *operands)
\ No newline at end of file
+## Operators only ever coerce exactly two operands, so the result for each pair of
+## value types is worked out ahead of time. Anything else goes through coerce_operands().
+def _build_pair_table(rules: Sequence[type]) -> Mapping[Tuple[type, type], type]:
+    table = {}
+    for a in rules:
+        for b in rules:
+            table[a, b] = next(
+                priority_type for priority_type in rules
+                if issubclass(a, priority_type) or issubclass(b, priority_type)
+            )
+    return table
+
+_ARRAY_PAIRS = _build_pair_table(COERCION_RULES[Operand.Array])
+_NUMBER_PAIRS = _build_pair_table(COERCION_RULES[Operand.Number])
+
+
+def coerce_array(a: ScriptValue, b: ScriptValue) -> Union[Type[ArrayValue], Type[TupleValue]]:
+    rtype = _ARRAY_PAIRS.get((type(a), type(b)))
+    if rtype is None:
+        return coerce_operands(Operand.Array, a, b)
+    return rtype
+
+def coerce_number(a: ScriptValue, b: ScriptValue) -> Union[Type[IntValue], Type[FloatValue]]:
+    rtype = _NUMBER_PAIRS.get((type(a), type(b)))
+    if rtype is None:
+        return coerce_operands(Operand.Number, a, b)
+    return rtype
@@ -20,29 +20,29 @@ if TYPE_CHECKING:
 
 @ophandler_untyped(Operator.Equal, 2)
 def operator_equal(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a == b)
+    return [BoolValue.get_value(a == b)]
 
 @ophandler_untyped(Operator.NE, 2)
 def operator_ne(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a != b)
+    return [BoolValue.get_value(a != b)]
 
 # logical not
 @ophandler_untyped(Operator.Not, 1)
 def operator_not(ctx, a) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(not bool(a))
+    return [BoolValue.get_value(not bool(a))]
 
 # logical and, or, xor
 @ophandler_typed(Operator.BitAnd, Operand.Bool, Operand.Bool)
 def operator_bitand(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a.value & b.value)
+    return [BoolValue.get_value(a.value & b.value)]
 
 @ophandler_typed(Operator.BitOr, Operand.Bool, Operand.Bool)
 def operator_bitor(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a.value | b.value)
+    return [BoolValue.get_value(a.value | b.value)]
 
 @ophandler_typed(Operator.BitXor, Operand.Bool, Operand.Bool)
 def operator_bitxor(ctx, a, b) -> Iterable[ScriptValue]:
-    yield BoolValue.get_value(a.value ^ b.value)
+    return [BoolValue.get_value(a.value ^ b.value)]
 
 
 ###### Control Flow / Short-circuiting logic
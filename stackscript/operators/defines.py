@@ -4,7 +4,7 @@ from enum import Enum, auto
 from typing import TYPE_CHECKING, NamedTuple
 
 if TYPE_CHECKING:
-    pass
+    from typing import Any, Union, Callable, Optional, Sequence, Mapping, MutableMapping
 
 
 class Operand(Enum):
@@ -12,6 +12,7 @@ class Operand(Enum):
     # Nil         = auto()
     Bool        = auto()
     Number      = auto()
+    Int         = auto()  # ints are also Numbers, see OPERAND_SPECIALIZATIONS in the overloading module
     String      = auto()
     Array       = auto()
     Exec       = auto()
@@ -28,6 +29,14 @@ class OperatorInfo(NamedTuple):
 class Operator(Enum):
     value: OperatorInfo
 
+    # set up by the overloading module
+    _dispatch: MutableMapping[Union[Sequence[Operand], int], Any]
+    _max_arity: int
+    _typed: Mapping[int, Any]
+    _untyped: Mapping[int, Any]
+    _executor: Optional[Callable[[Any, Any], None]]
+    _resolved: MutableMapping[Any, Any]
+
     Invert  = OperatorInfo('~', r'~(?!=)')    # bitwise not, array dump
     Quote = OperatorInfo('`', r'`')
     Eval    = OperatorInfo('!', r'!')
@@ -82,4 +91,8 @@ class Operator(Enum):
     def pattern(self) -> str:
         return self.value.pattern
 
+    def is_keyword(self) -> bool:
+        """Keyword operators are spelled like identifiers, e.g. 'and', 'while'."""
+        return self.value.operator.isidentifier()
+
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, cast, Iterable, Sequence
 
-from stackscript.runtime import CtxFlags
+from stackscript import CtxFlags
 from stackscript.values import CtxExecValue, BlockValue, StringValue, TupleValue, SequenceValue, BindingTarget
 from stackscript.parser import Identifier, Literal
 from stackscript.exceptions import ScriptOperandError, ScriptSyntaxError, ScriptAssignmentError
@@ -19,7 +19,7 @@ if TYPE_CHECKING:
 
 @ophandler_untyped(Operator.Quote, 1)
 def operator_quote(ctx, o) -> Iterable[ScriptValue]:
-    yield StringValue(o.format())
+    return [StringValue(o.format())]
 
 
 ###### Dup
@@ -99,7 +99,7 @@ def operator_compose(ctx: ContextFrame, arg, block) -> Iterable[ScriptValue]:
     sub_ctx = ctx.create_child()
     sub_ctx.push_stack(arg)
     block.apply_exec(sub_ctx)
-    yield TupleValue(sub_ctx.iter_stack_result())
+    return [TupleValue(sub_ctx.iter_stack_result())]
 
 
 ###### Assignment
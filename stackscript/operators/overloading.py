@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import itertools
-from collections import defaultdict
 from typing import TYPE_CHECKING, NamedTuple, Iterable
 
 from stackscript.values import ScriptValue
@@ -9,16 +8,29 @@ from stackscript.exceptions import ScriptOperandError
 from stackscript.operators.defines import Operator, Operand
 
 if TYPE_CHECKING:
-    from typing import Any, Union, Callable, Sequence, MutableMapping
+    from typing import Any, Union, Callable, Iterator, Sequence, Mapping, MutableMapping, Tuple
     from stackscript.runtime import ContextFrame
 
     Signature = Sequence[Operand]
     OperatorFunc = Callable[[ContextFrame, ...], Iterable[ScriptValue]]
+    OperatorExec = Callable[[ContextFrame, Any], None]
 
 
-# map operator -> signature -> operator data
-OP_REGISTRY: MutableMapping[Operator, MutableMapping[Union[Signature, int], OperatorOverload]] = defaultdict(dict)
-OP_ARITY: MutableMapping[Operator, int] = defaultdict(int)
+# Some operands are a more specific kind of another operand, e.g. every Int is also a Number.
+# A handler registered for the general operand is also registered for each specialization of it,
+# unless a more specific handler is registered for the same signature.
+OPERAND_SPECIALIZATIONS: Mapping[Operand, Sequence[Operand]] = {
+    Operand.Number : [ Operand.Int ],
+}
+
+# registry entries that were implied by a more general signature -> how many operands were specialized
+_implied: MutableMapping[Tuple[Operator, Signature], int] = {}
+
+# each operator holds its own registry (signature -> operator data) and maximum arity,
+# so neither registering nor dispatching needs to hash the operator
+for _op in Operator:
+    _op._dispatch = {}
+    _op._max_arity = 0
 
 
 class OperatorOverload(NamedTuple):
@@ -28,53 +40,179 @@ class OperatorOverload(NamedTuple):
     func: OperatorFunc
 
 
-def apply_operator(ctx: ContextFrame, op: Operator) -> None:
-    opdata = _search_registery(op, ctx)
-
-    args = [ ctx.pop_stack() for i in range(opdata.arity) ]
-
-    for value in opdata.func(ctx, *reversed(args)):
-        if not isinstance(value, ScriptValue):
-            raise TypeError(f"invalid object type yielded from operator {opdata}: {type(value)}", value)
-        ctx.push_stack(value)
-
-def _search_registery(op: Operator, ctx: ContextFrame) -> OperatorOverload:
-    registry = OP_REGISTRY[op]
-    arity = OP_ARITY[op]
+def resolve_operator(op: Operator) -> OperatorExec:
+    """Get an executor for one occurrence of an operator in compiled code.
+    The executor is called as executor(ctx, arg), the second argument is ignored."""
+    if not _frozen:
+        raise RuntimeError(f"cannot resolve {op}, the operator registry has not been frozen")
+    if op._executor is not None:
+        return op._executor
+    return _build_cached_executor(op)
+
+## An operator with a nullary overload never needs to look at the stack, so every occurrence
+## can share a single executor that is built once the registry is frozen.
+def _build_nullary_executor(nullary: OperatorOverload) -> OperatorExec:
+    func = nullary.func
+    def exec_nullary(ctx: ContextFrame, _: Any) -> None:
+        for value in func(ctx):
+            if not isinstance(value, ScriptValue):
+                raise TypeError(f"invalid object type yielded from operator {nullary}: {type(value)}", value)
+            ctx.push_stack(value)
+    return exec_nullary
+
+## Inline caching. Each place an operator appears in compiled code gets its own executor that
+## remembers the value types of the operands it saw last. Overload resolution only looks at the optype
+## of each operand and that is fixed per value type, so while the types on top of the stack are the same
+## the same overload will be found and the search can be skipped. A different set of types just replaces the cache.
+## Only unary and binary overloads are cached, which covers nearly everything.
+def _build_cached_executor(op: Operator) -> OperatorExec:
+    typed, untyped = op._typed, op._untyped
+    arity = op._max_arity
+    resolved = op._resolved
+
+    cache_opdata = None
+    cache_nargs = 0
+    cache_a = cache_b = None  # types of the operands, a is the top of the stack
+
+    def exec_operator(ctx: ContextFrame, _: Any) -> None:
+        nonlocal cache_opdata, cache_nargs, cache_a, cache_b
+
+        stack = ctx._stack
+        if cache_nargs == 2 and len(stack) >= 2 and type(stack[-1]) is cache_a and type(stack[-2]) is cache_b:
+            opdata = cache_opdata
+        elif cache_nargs == 1 and stack and type(stack[-1]) is cache_a:
+            opdata = cache_opdata
+        else:
+            opdata = _resolve_overload(typed, untyped, arity, resolved, ctx)
+            cache_nargs = opdata.arity if opdata.arity <= 2 else 0
+            if cache_nargs:
+                cache_opdata = opdata
+                cache_a = type(stack[-1])
+                cache_b = type(stack[-2]) if cache_nargs == 2 else None
+
+        nargs = opdata.arity
+        if nargs == 2:
+            b = stack.pop()
+            a = stack.pop()
+            results = opdata.func(ctx, a, b)
+        elif nargs == 1:
+            results = opdata.func(ctx, stack.pop())
+        else:
+            results = opdata.func(ctx, *ctx.pop_stack_many(nargs))
+
+        for value in results:
+            if not isinstance(value, ScriptValue):
+                raise TypeError(f"invalid object type yielded from operator {opdata}: {type(value)}", value)
+            ctx.push_stack(value)
+    return exec_operator
+
+## Behind the inline caches, each operator keeps a table of every overload it has resolved so far, shared by
+## all of its occurrences. This is what keeps polymorphic sites (e.g. a + that sees both ints and strings) cheap.
+## Keys are the operand value types: type(a) for unary overloads, (type(a), type(b)) for binary, a is the top of the stack.
+## A binary entry for type(a) can only exist if the unary search for type(a) already failed, so the order is safe.
+def _resolve_overload(typed: Mapping[int, OperatorOverload], untyped: Mapping[int, OperatorOverload], arity: int,
+                      resolved: MutableMapping[Any, OperatorOverload], ctx: ContextFrame) -> OperatorOverload:
+    stack = ctx._stack
+    if stack:
+        opdata = resolved.get(type(stack[-1]))
+        if opdata is None and len(stack) >= 2:
+            opdata = resolved.get((type(stack[-1]), type(stack[-2])))
+        if opdata is not None:
+            return opdata
 
-    # nargs == 0
-    opdata = registry.get(()) or registry.get(0)
-    if opdata is not None:
-        return opdata
+    opdata = _search_registery(typed, untyped, arity, ctx)
+    if opdata.arity == 1:
+        resolved[type(stack[-1])] = opdata
+    elif opdata.arity == 2:
+        resolved[type(stack[-1]), type(stack[-2])] = opdata
+    return opdata
 
-    args = []
+def _search_registery(typed: Mapping[int, OperatorOverload], untyped: Mapping[int, OperatorOverload], arity: int, ctx: ContextFrame) -> OperatorOverload:
+    key = 0
+    nargs = 0
     for next_arg in ctx.iter_stack():
-        args.append(next_arg)
-        signature = tuple(value.optype for value in reversed(args))
-        nargs = len(args)
+        key = (key << 8) | next_arg.optype._value_  # same packing as _signature_key()
+        nargs += 1
 
-        opdata = registry.get(signature)
+        opdata = typed.get(key)
         if opdata is not None:
             return opdata
 
-        opdata = registry.get(nargs)
+        opdata = untyped.get(nargs)
         if opdata is not None:
             return opdata
 
         if nargs >= arity:
-            raise ScriptOperandError("invalid operands", *args)
+            raise ScriptOperandError("invalid operands", *itertools.islice(ctx.iter_stack(), nargs))
 
     raise ScriptOperandError("not enough operands")
 
+## For dispatch, typed signatures are packed into a single int with 8 bits per operand, starting from the
+## top of the stack (the last operand in the signature). This lets the search build the key one operand at a time
+## without allocating a tuple. Operand values start at 1, so signatures of different lengths never share a key.
+def _signature_key(signature: Signature) -> int:
+    key = 0
+    for optype in reversed(signature):
+        key = (key << 8) | optype._value_
+    return key
+
+_frozen = False
+
+def freeze_registry() -> None:
+    """Called once all operator overloads have been loaded. No further overloads may be registered after this."""
+    global _frozen
+    _frozen = True
+
+    for op in Operator:
+        registry = op._dispatch
+        op._typed = { _signature_key(sig) : opdata for sig, opdata in registry.items() if not isinstance(sig, int) }
+        op._untyped = { sig : opdata for sig, opdata in registry.items() if isinstance(sig, int) }
+        op._resolved = {}
+        nullary = op._untyped.get(0)
+        op._executor = _build_nullary_executor(nullary) if nullary is not None else None
+
 def _register_operator(opdata: OperatorOverload) -> None:
-    registry = OP_REGISTRY[opdata.op]
+    if _frozen:
+        raise RuntimeError(f"cannot register {opdata.op} overload, the operator registry is frozen")
+
+    registry = opdata.op._dispatch
+
+    # an empty signature is the same as an untyped handler that takes no operands
+    if opdata.signature == ():
+        opdata = opdata._replace(signature=0)
 
     signature = opdata.signature
-    if signature in registry:
+    if signature in registry and (opdata.op, signature) not in _implied:
         raise ValueError(f"signature {signature} is already registered for {opdata.op}")
 
+    _add_registry_entry(registry, opdata, signature, 0)
+    if not isinstance(signature, int):
+        for implied, specialized in _specialize_signature(signature):
+            _add_registry_entry(registry, opdata, implied, specialized)
+
+    opdata.op._max_arity = max(opdata.op._max_arity, opdata.arity)
+
+def _add_registry_entry(registry: MutableMapping[Union[Signature, int], OperatorOverload], opdata: OperatorOverload,
+                        signature: Union[Signature, int], specialized: int) -> None:
+    # the most specific handler for a signature wins, explicitly registered signatures are the most specific
+    key = opdata.op, signature
+    if signature in registry:
+        current = _implied.get(key)
+        if current is None or current <= specialized:
+            return
+
     registry[signature] = opdata
-    OP_ARITY[opdata.op] = max(OP_ARITY[opdata.op], opdata.arity)
+    if specialized:
+        _implied[key] = specialized
+    else:
+        _implied.pop(key, None)
+
+def _specialize_signature(signature: Signature) -> Iterator[Tuple[Signature, int]]:
+    choices = [ [optype, *OPERAND_SPECIALIZATIONS.get(optype, ())] for optype in signature ]
+    for implied in itertools.product(*choices):
+        specialized = sum(1 for a, b in zip(signature, implied) if a is not b)
+        if specialized:
+            yield implied, specialized
 
 
 ###### Overload Decorators
@@ -100,21 +238,29 @@ def ophandler_permute(op: Operator, primary: Operand, *secondary: Operand):
 
     def decorator(func: OperatorFunc):
         # print(func.__name__, base_sig)
+
+        # fast path for binary operators, just register the original and swapped signatures
+        if len(base_sig) == 2:
+            a, b = base_sig
+            _register_operator(OperatorOverload(op, 2, (a, b), func))
+            _register_operator(OperatorOverload(op, 2, (b, a), lambda ctx, x, y: func(ctx, y, x)))
+            return func
+
         for permute in itertools.permutations(range(len(base_sig))):
             signature = tuple(base_sig[i] for i in permute)
 
-            reorder = _ReorderFunc(func, permute)
+            reorder = _reorder_func(func, permute)
             opdata = OperatorOverload(op, len(signature), signature, reorder)
             _register_operator(opdata)
         return func
     return decorator
 
-class _ReorderFunc(NamedTuple):
-    func: Callable
-    permute: Sequence[int]
+def _reorder_func(func: OperatorFunc, permute: Sequence[int]) -> OperatorFunc:
+    if permute == tuple(range(len(permute))):
+        return func
 
-    def __call__(self, ctx: ContextFrame, *args: Any) -> Any:
-        # print(self.permute, args)
-        # print(*( args[i].type for i in self.permute ))
-        return self.func(ctx, *( args[i] for i in self.permute ))
+    # the closure avoids attribute lookups on each call
+    def reorder(ctx: ContextFrame, *args: Any) -> Any:
+        return func(ctx, *( args[i] for i in permute ))
+    return reorder
 
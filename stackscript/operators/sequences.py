@@ -30,8 +30,7 @@ def operator_collect(ctx: ContextFrame, n) -> Iterable[ScriptValue]:
     if not isinstance(n, IntValue):
         raise ScriptOperandError("unsupported operand type", n)
 
-    result = [ctx.pop_stack() for i in range(n.value)]
-    return [TupleValue(reversed(result))]
+    return [TupleValue(ctx.pop_stack_many(n.value))]
 
 
 ###### Index
@@ -78,7 +77,7 @@ def operator_index(ctx: ContextFrame, array, index) -> Iterable[ScriptValue]:
 @ophandler_typed(Operator.Size, Operand.Array)
 @ophandler_typed(Operator.Size, Operand.String)
 def operator_size(ctx, seq) -> Iterable[ScriptValue]:
-    yield IntValue(len(seq))
+    return [IntValue.get_value(len(seq))]
 
 
 ###### Concatenation
@@ -87,12 +86,12 @@ def operator_size(ctx, seq) -> Iterable[ScriptValue]:
 @ophandler_typed(Operator.Add, Operand.Array, Operand.Array)
 def operator_concat(ctx, a, b) -> Iterable[ScriptValue]:
     rtype = coerce_array(a, b)
-    return [rtype([*a, *b])]
+    return [rtype.from_list([*a, *b])]
 
 # concatenate strings
 @ophandler_typed(Operator.Add, Operand.String, Operand.String)
 def operator_concat(ctx, a, b) -> Iterable[ScriptValue]:
-    yield StringValue(a.value + b.value)
+    return [StringValue(a.value + b.value)]
 
 
 ###### Array/String Repeat
@@ -101,13 +100,13 @@ def operator_concat(ctx, a, b) -> Iterable[ScriptValue]:
 @ophandler_permute(Operator.Mul, Operand.Number, Operand.Array)
 def operator_repeat(ctx, repeat, array) -> Iterable[ScriptValue]:
     ctor = type(array)
-    yield ctor( data for data in array for i in range(repeat.value) )
+    return [ctor.from_list([ data for data in array for i in range(repeat.value) ])]
 
 # array/string repeat
 @ophandler_permute(Operator.Mul, Operand.Number, Operand.String)
 def operator_repeat(ctx, repeat, text) -> Iterable[ScriptValue]:
     text = ''.join(text.value for i in range(repeat.value))
-    yield StringValue(text)
+    return [StringValue(text)]
 
 
 ###### Array difference
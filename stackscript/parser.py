@@ -1,164 +1,286 @@
 from __future__ import annotations
 
+import re
+import sys
 import string
-from enum import Enum, auto
-from typing import TYPE_CHECKING, NamedTuple, Protocol, runtime_checkable
-
-from ply import lex
+from enum import Enum, IntEnum, auto
+from typing import TYPE_CHECKING, NamedTuple, Protocol
 
 from stackscript.operators.defines import Operator
 from stackscript.exceptions import ScriptSyntaxError
+from stackscript.values import BoolValue, IntValue, FloatValue, StringValue, TupleValue, BlockValue
 
 if TYPE_CHECKING:
-    from typing import Any, Union, Optional, Type, Iterator, Iterable, Callable, Mapping
+    from typing import Any, Union, Optional, Type, Tuple, Iterator, Iterable, Callable, Mapping, MutableMapping, Sequence, MutableSequence
+    from stackscript.values import ScriptValue
 
 
 ###### Lexer
 
 if TYPE_CHECKING:
-    TokenData = Union['DelimiterToken', 'OperatorToken', 'PrimitiveLiteralToken', 'IdentifierToken']
+    TokenData = Union['DelimiterToken', 'OperatorToken', 'PrimitiveToken', 'IdentifierToken']
 
-class Token(NamedTuple):
-    data: TokenData
-    lineno: int
-    lexpos: int
+# Tokens are created for every symbol in a script, so they are plain slotted classes rather than
+# NamedTuples, which are slower to construct and access. Treat them as immutable all the same.
+class _TokenBase:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{self.__class__.__name__}({fields})'
+
+class Token(_TokenBase):
+    __slots__ = ('data', 'lineno', 'lexpos')
+
+    def __init__(self, data: TokenData, lineno: int, lexpos: int):
+        self.data = data
+        self.lineno = lineno
+        self.lexpos = lexpos
 
-class Delimiter(Enum):
-    StartBlock = r'{'
-    EndBlock   = r'}'
-    StartArray = r'\['
-    EndArray   = r'\]'
-    StartTuple = r'\('
-    EndTuple   = r'\)'
+# These enums are used as dictionary keys while parsing and running scripts. IntEnum members
+# hash and compare as plain ints, which is much cheaper than the Enum base class.
+class _TextEnum(IntEnum):
+    """An IntEnum whose members are numbered in definition order, with the
+    text they are defined with kept in the "text" attribute."""
+
+    text: str
+
+    def __new__(cls, text: str) -> _TextEnum:
+        value = len(cls.__members__) + 1
+        member = int.__new__(cls, value)
+        member._value_ = value
+        member.text = text
+        return member
+
+    __str__ = Enum.__str__
+
+class Delimiter(_TextEnum):
+    StartBlock = '{'
+    EndBlock   = '}'
+    StartArray = '['
+    EndArray   = ']'
+    StartTuple = '('
+    EndTuple   = ')'
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__qualname__}.{self.name}>'
 
     @property
     def pattern(self) -> str:
-        return self.value
+        return re.escape(self.text)
 
-class DelimiterToken(NamedTuple):
-    text: str
-    delim: Delimiter
+class DelimiterToken(_TokenBase):
+    __slots__ = ('text', 'delim')
 
-class OperatorToken(NamedTuple):
-    text: str
-    operator: Operator
+    def __init__(self, text: str, delim: Delimiter):
+        self.text = text
+        self.delim = delim
+
+class OperatorToken(_TokenBase):
+    __slots__ = ('text', 'operator')
 
-class PrimitiveLiteral(Enum):
+    def __init__(self, text: str, operator: Operator):
+        self.text = text
+        self.operator = operator
+
+# The patterns describe the syntax of each literal. The lexer scans them by hand;
+# a number is a Float if it contains a decimal point and an Integer otherwise.
+class PrimitiveLiteral(_TextEnum):
     Bool    = r'true|false'
-    Integer = r'[+-]?[0-9]+(?!\.)(?![a-zA-Z_])'
-    Float   = r'[+-]?([0-9]+\.?[0-9]*|[0-9]*\.?[0-9]+)(?![a-zA-Z_])'
-    String  = r'\'.*?\'|".*?"'
+    Integer = r'[+-]?[0-9]+'
+    Float   = r'[+-]?(?:[0-9]+\.[0-9]*|\.[0-9]+)'
+    String  = r'\'[^\'\n]*\'|"[^"\n]*"'
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__qualname__}.{self.name}>'
 
     @property
     def pattern(self) -> str:
-        return self.value
+        return self.text
 
 ## Primitive Literals
-class PrimitiveToken(NamedTuple):
-    text: str
-    literal: PrimitiveLiteral
-
-class IdentifierToken(NamedTuple):
-    text: str
-
-
-## PLY Rules
-class Lexer:
-    tokens = (
-        'ignore',
-        'ignore_comment',
-
-        ## Delimiters
-        *(delim.name for delim in Delimiter),
+class PrimitiveToken(_TokenBase):
+    __slots__ = ('text', 'literal')
 
-        ## Literals
-        *(lit.name for lit in PrimitiveLiteral),
+    def __init__(self, text: str, literal: PrimitiveLiteral):
+        self.text = text
+        self.literal = literal
 
-        ## Operators
-        *(op.name for op in Operator),
+class IdentifierToken(_TokenBase):
+    __slots__ = ('text',)
 
-        ## Identifiers
-        'Identifier',
-    )
+    def __init__(self, text: str):
+        self.text = text
 
-    t_ignore = string.whitespace
-    t_ignore_comment = r'//.*'
 
-    def t_newline(self, t):
-        r'\n+'
-        t.lexer.lineno += len(t.value)
+class Lexer:
+    """Splits script text into tokens.
 
-    # Error handling rule
-    def t_error(self, t):
-        meta = SymbolMeta(t.value, t.lexpos, t.lineno)
-        raise ScriptSyntaxError('invalid syntax', meta)
-        # print(f"Illegal character '{t.value[0]}'")
-        # t.lexer.skip(1)
+    This is a hand-written scanner. The first character of each token is used to pick
+    a scanning function which then consumes the rest of the token."""
 
-    def __init__(self, _copy = None, **kwargs):
-        if _copy is not None:
-            self._lexer = _copy.clone()
-        else:
-            self._lexer = lex.lex(object=self, **kwargs)
+    _text: str = ''
 
     def clone(self) -> Lexer:
-        return Lexer(self._lexer)
+        return Lexer()
 
     def input(self, text: str) -> None:
-        self._lexer.input(text)
+        self._text = text
 
     def get_tokens(self) -> Iterator[Token]:
-        for t in self._lexer:
-            yield Token(t.value, t.lineno, t.lexpos)
-
-## Lexing rules
-## The order here is important, it defines the rule precedence
-
-# creating a class for this avoids issues with closures
-class TokenHandler:
-    def __init__(self, name: str, pattern: str, ctor: Callable, *data: Any):
-        self.name = name
-        self.pattern = pattern
-        self.ctor = ctor
-        self.data = data
-
-    def __call__(self, t):
-        return self.ctor(t.value, *self.data)
-
-    def add_handler(self, lex_cls: Type[Lexer]) -> None:
-        @lex.TOKEN(self.pattern)
-        def wrapped(lexer, t):
-            t.value = self(t)
-            return t
-        setattr(lex_cls, 't_' + self.name, wrapped)
-
-## Delimiters
-for delim in Delimiter:
-    handler = TokenHandler(delim.name, delim.pattern, DelimiterToken, delim)
-    handler.add_handler(Lexer)
+        text = self._text
+        end = len(text)
+        pos = 0
+        lineno = 1
+
+        # the tables are consulted for every character, so look them up once
+        whitespace = _whitespace
+        skip = _skip_pattern.match
+        single_char_tokens = _single_char_tokens
+        scanners = _scanners
+
+        while pos < end:
+            c = text[pos]
+
+            if c in whitespace or text.startswith('//', pos):
+                match = skip(text, pos)
+                lineno += text.count('\n', pos, match.end())
+                pos = match.end()
+                continue
 
-## Literals
-for lit in PrimitiveLiteral:
-    handler = TokenHandler(lit.name, lit.pattern, PrimitiveToken, lit)
-    handler.add_handler(Lexer)
+            code = ord(c)
+            if code < 128:
+                data = single_char_tokens[code]
+                if data is not None:
+                    yield Token(data, lineno, pos)
+                    pos += 1
+                    continue
+                scan = scanners[code]
+            else:
+                scan = None
+
+            result = scan(text, pos) if scan is not None else None
+            if result is None:
+                line_end = text.find('\n', pos)
+                meta = SymbolMeta(text[pos:line_end] if line_end >= 0 else text[pos:], pos, lineno)
+                raise ScriptSyntaxError('invalid syntax', meta)
+
+            data, next_pos = result
+            yield Token(data, lineno, pos)
+            pos = next_pos
+
+## Scanning functions
+## Each takes the text and the position of the first character of the token
+## and returns the token data along with the position of the next character after the token,
+## or None if a valid token could not be scanned.
 
-## Operators
+if TYPE_CHECKING:
+    ScanResult = Optional[Tuple[TokenData, int]]
+
+_whitespace = frozenset(string.whitespace)
+# consumes the entire gap between two tokens, including any number of comments, in one call
+_skip_pattern = re.compile('(?:[' + re.escape(string.whitespace) + ']+|//.*)+')
+
+# strings run up to the next matching quote, and may not span lines
+def _scan_string(text: str, pos: int) -> ScanResult:
+    end = text.find(text[pos], pos + 1)
+    if end < 0 or text.find('\n', pos, end) >= 0:
+        return None
+    end += 1
+    return PrimitiveToken(text[pos:end], PrimitiveLiteral.String), end
+
+# Numbers are scanned by hand rather than with the Integer and Float patterns, whose lookaheads
+# make the regex engine backtrack. A number is an optional sign, then digits with at most one
+# decimal point, and must not run straight into an identifier.
+# Numbers may also start with a sign or a decimal point, so if there are no digits try an operator instead.
+_identifier_chars = frozenset(string.ascii_letters + string.digits + '_')
+def _scan_number(text: str, pos: int) -> ScanResult:
+    end = len(text)
+    next_pos = pos
+    if text[next_pos] in '+-':
+        next_pos += 1
+
+    start_digits = next_pos
+    while next_pos < end and '0' <= text[next_pos] <= '9':
+        next_pos += 1
+    has_digits = next_pos > start_digits
+    literal = PrimitiveLiteral.Integer
+
+    if next_pos < end and text[next_pos] == '.':
+        next_pos += 1
+        start_digits = next_pos
+        while next_pos < end and '0' <= text[next_pos] <= '9':
+            next_pos += 1
+        has_digits = has_digits or next_pos > start_digits
+        literal = PrimitiveLiteral.Float
+
+    if not has_digits:
+        return _scan_operator(text, pos)
+    if next_pos < end and text[next_pos] in _identifier_chars:
+        return None
+    return PrimitiveToken(text[pos:next_pos], literal), next_pos
+
+# Symbolic operators are only ever one or two characters long, so instead of trying
+# a separate regex for each of them they are looked up in a table indexed by the first character.
+# Within each entry, longer operators come first so that the longest match wins.
+# A few operator patterns use a lookahead to reserve longer sequences (e.g. ++ and <<) that are not
+# operators yet. Those operators are still checked against their pattern, so the reserved sequences remain errors.
+_symbol_operators: Sequence[MutableSequence[Tuple[OperatorToken, Optional[re.Pattern]]]] = [ [] for i in range(128) ]
+for op in sorted(Operator, key=lambda op: len(str(op)), reverse=True):
+    if not op.is_keyword():
+        reserved = re.compile(op.pattern) if '(?!' in op.pattern else None
+        _symbol_operators[ord(str(op)[0])].append((OperatorToken(str(op), op), reserved))
+
+def _scan_operator(text: str, pos: int) -> ScanResult:
+    c = ord(text[pos])
+    if c < 128:
+        for token, reserved in _symbol_operators[c]:
+            if text.startswith(token.text, pos):
+                if reserved is not None and reserved.match(text, pos) is None:
+                    return None
+                return token, pos + len(token.text)
+    return None
+
+# keywords are scanned like identifiers, and then looked up in the reserved words table
+_reserved_words: Mapping[str, TokenData] = {
+    'true'  : PrimitiveToken('true', PrimitiveLiteral.Bool),
+    'false' : PrimitiveToken('false', PrimitiveLiteral.Bool),
+    **{ str(op) : OperatorToken(str(op), op) for op in Operator if op.is_keyword() },
+}
+
+_word_pattern = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+def _scan_word(text: str, pos: int) -> ScanResult:
+    match = _word_pattern.match(text, pos)
+    word = match.group()
+    data = _reserved_words.get(word)
+    if data is None:
+        data = IdentifierToken(sys.intern(word))
+    return data, match.end()
+
+# scanning function table, indexed by the character code of the first character of a token
+_scanners: MutableSequence[Optional[Callable[[str, int], ScanResult]]] = [ None for i in range(128) ]
 for op in Operator:
-    handler = TokenHandler(op.name, op.pattern, OperatorToken, op)
-    handler.add_handler(Lexer)
-
-## Identifiers
-@lex.TOKEN(r'[a-zA-Z_][a-zA-Z0-9_]*')
-def t_Identifier(self, t):
-    t.value = IdentifierToken(t.value)
-    return t
-Lexer.t_Identifier = t_Identifier
+    if not op.is_keyword():
+        _scanners[ord(str(op)[0])] = _scan_operator
+for c in '\'"':
+    _scanners[ord(c)] = _scan_string
+for c in string.digits + '+-.':
+    _scanners[ord(c)] = _scan_number
+for c in string.ascii_letters + '_':
+    _scanners[ord(c)] = _scan_word
+
+# Token data is immutable, so tokens that are always spelled the same are shared.
+# Characters that can only ever be a complete token on their own are emitted straight from this
+# table, without calling a scanning function: all of the delimiters, and any single character
+# operator that is not also the start of a longer operator or a number.
+_single_char_tokens: MutableSequence[Optional[TokenData]] = [ None for i in range(128) ]
+for delim in Delimiter:
+    _single_char_tokens[ord(delim.text)] = DelimiterToken(delim.text, delim)
+for tokens in _symbol_operators:
+    if len(tokens) == 1:
+        token, reserved = tokens[0]
+        if len(token.text) == 1 and reserved is None and _scanners[ord(token.text)] is _scan_operator:
+            _single_char_tokens[ord(token.text)] = token
 
 
 
@@ -166,20 +288,47 @@ Lexer.t_Identifier = t_Identifier
 
 # Note: all ScriptSymbol types must be IMMUTABLE!
 
-@runtime_checkable
+# only used for type annotations, symbols are never checked against it with isinstance()
 class ScriptSymbol(Protocol):
     meta: SymbolMeta
 
     # def get_type(self) -> SymbolType:
     #     ...
 
-class SymbolMeta(NamedTuple):
+# One of these is created for every symbol, so it is a slotted class rather than a NamedTuple.
+# It still compares and hashes by value, since symbols (and so blocks) are compared structurally.
+class SymbolMeta:
+    __slots__ = ('text', 'pos', 'lineno', 'start')
+
     text: str
     pos: int
     lineno: int
+    start: Optional[SymbolMeta]  # if this is part of a opening/closing delimiter pair
+
+    def __init__(self, text: str, pos: int, lineno: int, start: Optional[SymbolMeta] = None):
+        self.text = text
+        self.pos = pos
+        self.lineno = lineno
+        self.start = start
+
+    def _astuple(self) -> Tuple[str, int, int, Optional[SymbolMeta]]:
+        return self.text, self.pos, self.lineno, self.start
 
-    # if this is part of a opening/closing delimiter pair
-    start: Optional[SymbolMeta] = None
+    def _replace(self, **kwargs: Any) -> SymbolMeta:
+        fields = dict(zip(self.__slots__, self._astuple()))
+        fields.update(kwargs)
+        return SymbolMeta(**fields)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(text={self.text!r}, pos={self.pos!r}, lineno={self.lineno!r}, start={self.start!r})'
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, SymbolMeta):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
 
 class Identifier(NamedTuple):
     name: str
@@ -195,7 +344,7 @@ class Identifier(NamedTuple):
     #     return SymbolType.Identifier
 
 # closely related to but distinct from the set of data types
-class LiteralType(Enum):
+class LiteralType(IntEnum):
     Bool    = auto()
     Integer = auto()
     Float   = auto()
@@ -212,6 +361,12 @@ class Literal(NamedTuple):
     value: Any  ## MUST BE IMMUTABLE
     meta: SymbolMeta
 
+    # the evaluated value, if it can be computed once at parse time
+    constant: Optional[ScriptValue] = None
+
+    # for structured literals, the evaluated contents if they can all be computed once at parse time
+    elements: Optional[Sequence[ScriptValue]] = None
+
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({self.value!r})'
 
@@ -244,6 +399,10 @@ class OperatorSym(NamedTuple):
 #     def as_type(self) -> Type[ScriptSymbol]:
 #         return self.value
 
+# integer literals that have already been parsed, so that a number that appears many times is only converted once
+_INT_LITERALS_MAX = 4096
+_int_literals: MutableMapping[str, IntValue] = {}
+
 class Parser:
     _delimiters = {
         Delimiter.StartBlock : Delimiter.EndBlock,
@@ -251,74 +410,71 @@ class Parser:
         Delimiter.StartTuple : Delimiter.EndTuple,
     }
 
-    _parse_tokens: Mapping[Type[TokenData], Callable[[Iterator[Token], TokenData, SymbolMeta], ScriptSymbol]]
-    _parse_primitives: Mapping[PrimitiveLiteral, Callable[[TokenData, SymbolMeta], Literal]]
+    # dispatch tables for the parse methods, filled in after the class body
+    _parse_tokens: Mapping[Type[TokenData], Callable[[Parser, Iterator[Token], Token], ScriptSymbol]]
+    _primitive_dispatch: Mapping[PrimitiveLiteral, Callable[[Parser, Token], Literal]]
 
     def __init__(self, tokens: Iterable[Token]):
-        self._parse_tokens = {
-            DelimiterToken  : self._parse_delimiter,
-            OperatorToken   : self._parse_operator,
-            PrimitiveToken  : self._parse_primitive,
-            IdentifierToken : self._parse_identifier,
-        }
-
-        self._parse_primitives = {
-            PrimitiveLiteral.Bool    : self._parse_bool,
-            PrimitiveLiteral.Float   : self._parse_float,
-            PrimitiveLiteral.Integer : self._parse_int,
-            PrimitiveLiteral.String  : self._parse_string,
-        }
-
         self._tokens = iter(tokens)
 
     def get_symbols(self) -> Iterator[ScriptSymbol]:
-        for token in self._tokens:
-            yield self._parse_token(token)
+        # same as _parse_token(), inlined for the top level loop
+        parse_tokens = self._parse_tokens
+        tokens = self._tokens
+        for token in tokens:
+            fparse = parse_tokens.get(type(token.data))
+            if fparse is None:
+                raise NotImplementedError('no method to parse token: ' + repr(token))
+            yield fparse(self, tokens, token)
 
-    # build metadata table that can later be used to create a SymbolMeta instance
-    def _create_metadata(self, token: Token) -> Any:
-        return dict(
-            text = token.data.text,
-            pos = token.lexpos,
-            lineno = token.lineno,
-        )
+    # the parse methods are given the token itself and only create metadata for the symbols they produce
+    def _create_metadata(self, token: Token, start: Optional[SymbolMeta] = None) -> SymbolMeta:
+        return SymbolMeta(token.data.text, token.lexpos, token.lineno, start)
 
     def _parse_token(self, token: Token) -> ScriptSymbol:
-        meta = self._create_metadata(token)
-        for toktype, fparse in self._parse_tokens.items():
-            if isinstance(token.data, toktype):
-                return fparse(self._tokens, token.data, meta)
-        raise NotImplementedError('no method to parse token: ' + repr(token))
+        fparse = self._parse_tokens.get(type(token.data))
+        if fparse is None:
+            raise NotImplementedError('no method to parse token: ' + repr(token))
+        return fparse(self, self._tokens, token)
 
-    def _parse_operator(self, tokens: Iterator[Token], tokdata: OperatorToken, meta: Any) -> OperatorSym:
-        return OperatorSym(tokdata.operator, SymbolMeta(**meta))
+    def _parse_operator(self, tokens: Iterator[Token], token: Token) -> OperatorSym:
+        return OperatorSym(token.data.operator, self._create_metadata(token))
 
-    def _parse_identifier(self, tokens: Iterator[Token], tokdata: IdentifierToken, meta: Any) -> Identifier:
-        return Identifier(tokdata.text, SymbolMeta(**meta))
+    def _parse_identifier(self, tokens: Iterator[Token], token: Token) -> Identifier:
+        return Identifier(token.data.text, self._create_metadata(token))
 
-    def _parse_primitive(self, tokens: Iterator[Token], tokdata: PrimitiveToken, meta: Any) -> Literal:
-        return self._parse_primitives[tokdata.literal](tokdata, meta)
+    def _parse_primitive(self, tokens: Iterator[Token], token: Token) -> Literal:
+        return self._primitive_dispatch[token.data.literal](self, token)
 
     _bool_values = {
         'true'  : True,
         'false' : False,
     }
-    def _parse_bool(self, tokdata: PrimitiveToken, meta: Any) -> Literal:
-        return Literal(LiteralType.Bool, self._bool_values[tokdata.text], SymbolMeta(**meta))
+    def _parse_bool(self, token: Token) -> Literal:
+        value = self._bool_values[token.data.text]
+        return Literal(LiteralType.Bool, value, self._create_metadata(token), BoolValue.get_value(value))
 
     # todo HEX, OCT, BIN literals
-    def _parse_int(self, tokdata: PrimitiveToken, meta: Any) -> Literal:
-        return Literal(LiteralType.Integer, int(tokdata.text), SymbolMeta(**meta))
-
-    def _parse_float(self, tokdata: PrimitiveToken, meta: Any) -> Literal:
-        return Literal(LiteralType.Float, float(tokdata.text), SymbolMeta(**meta))
+    def _parse_int(self, token: Token) -> Literal:
+        text = token.data.text
+        constant = _int_literals.get(text)
+        if constant is None:
+            constant = IntValue.get_value(int(text))
+            if len(_int_literals) < _INT_LITERALS_MAX:
+                _int_literals[text] = constant
+        return Literal(LiteralType.Integer, constant.value, self._create_metadata(token), constant)
+
+    def _parse_float(self, token: Token) -> Literal:
+        value = float(token.data.text)
+        return Literal(LiteralType.Float, value, self._create_metadata(token), FloatValue(value))
 
     _str_delim = ("'", '"')
-    def _parse_string(self, tokdata: PrimitiveToken, meta: Any) -> Literal:
-        text = tokdata.text
+    def _parse_string(self, token: Token) -> Literal:
+        text = token.data.text
         if text[0] != text[-1] or text[0] not in self._str_delim:
-            raise ScriptSyntaxError('malformed string', SymbolMeta(**meta))
-        return Literal(LiteralType.String, text[1:-1], SymbolMeta(**meta))
+            raise ScriptSyntaxError('malformed string', self._create_metadata(token))
+        value = text[1:-1]
+        return Literal(LiteralType.String, value, self._create_metadata(token), StringValue(value))
 
     # for structured literals, the value is the symbol contents of the literal as an immutable sequence
     _structured_literals = {
@@ -326,28 +482,59 @@ class Parser:
         Delimiter.StartBlock : LiteralType.Block,
         Delimiter.StartTuple : LiteralType.Tuple
     }
-    def _parse_delimiter(self, tokens: Iterator[Token], tokdata: DelimiterToken, meta: Any) -> ScriptSymbol:
-        end_delim = self._delimiters.get(tokdata.delim)
+    def _parse_delimiter(self, tokens: Iterator[Token], start_token: Token) -> ScriptSymbol:
+        start_delim = start_token.data.delim
+        start_meta = self._create_metadata(start_token)
+
+        end_delim = self._delimiters.get(start_delim)
         if end_delim is None:
-            raise ScriptSyntaxError(f"found closing delimiter '{tokdata.delim}' without matching start", meta)
+            raise ScriptSyntaxError(f"found closing delimiter '{start_delim}' without matching start", start_meta)
 
         contents = []
+        append, parse_token = contents.append, self._parse_token
         for token in tokens:
             if not (isinstance(token.data, DelimiterToken) and token.data.delim == end_delim):
-                contents.append(self._parse_token(token))
+                append(parse_token(token))
                 continue
 
-            new_meta = self._create_metadata(token)
-            new_meta['start'] = SymbolMeta(**meta)
-            meta = SymbolMeta(**new_meta)
+            meta = self._create_metadata(token, start_meta)
 
             ## for now, all delimiter pairs result in a literal
-            literal = self._structured_literals.get(tokdata.delim)
+            literal = self._structured_literals.get(start_delim)
             if literal is not None:
-                return Literal(literal, tuple(contents), meta)
+                contents = tuple(contents)
+                return Literal(literal, contents, meta, *self._fold_contents(literal, contents))
             raise NotImplementedError('no method to parse token: ' + repr(token))
 
-        raise ScriptSyntaxError(f"could not find closing delimiter for '{tokdata.delim}'", SymbolMeta(**meta))
+        raise ScriptSyntaxError(f"could not find closing delimiter for '{start_delim}'", start_meta)
+
+    # blocks are never executed when evaluated, and tuples are constant if all of their contents are.
+    # arrays are mutable and so must be created anew each time they are evaluated,
+    # but if their contents are constant the new array can be made from the elements directly
+    def _fold_contents(self, literal: LiteralType, contents: Sequence[ScriptSymbol]) -> Tuple[Optional[ScriptValue], Optional[Sequence[ScriptValue]]]:
+        if literal == LiteralType.Block:
+            return BlockValue(contents), None
+        if not all(isinstance(sym, Literal) and sym.constant is not None for sym in contents):
+            return None, None
+
+        elements = tuple(sym.constant for sym in contents)
+        if literal == LiteralType.Tuple:
+            return TupleValue(elements), elements
+        return None, elements
+
+Parser._parse_tokens = {
+    DelimiterToken  : Parser._parse_delimiter,
+    OperatorToken   : Parser._parse_operator,
+    PrimitiveToken  : Parser._parse_primitive,
+    IdentifierToken : Parser._parse_identifier,
+}
+
+Parser._primitive_dispatch = {
+    PrimitiveLiteral.Bool    : Parser._parse_bool,
+    PrimitiveLiteral.Float   : Parser._parse_float,
+    PrimitiveLiteral.Integer : Parser._parse_int,
+    PrimitiveLiteral.String  : Parser._parse_string,
+}
 
 
 if __name__ == '__main__':
@@ -1,167 +1,272 @@
 from __future__ import annotations
 
-from collections import deque, ChainMap as chainmap
+from functools import lru_cache
+from collections import ChainMap as chainmap
 from typing import TYPE_CHECKING
 
 from stackscript import CtxFlags
 from stackscript.parser import LiteralType, Lexer, Parser, Identifier, Literal, OperatorSym
 from stackscript.exceptions import ScriptError, ScriptNameError
-from stackscript.operators.overloading import apply_operator
+from stackscript.operators.overloading import resolve_operator, freeze_registry
 
 ## operator overloads
 import stackscript.operators.general
 import stackscript.operators.arithmetic
 import stackscript.operators.sequences
 import stackscript.operators.conditional
+freeze_registry()
 
-from stackscript.values import (
-    BoolValue, IntValue, FloatValue, StringValue, ArrayValue, TupleValue, BlockValue, NameValue
-)
+from stackscript.values import ArrayValue, TupleValue, NameValue, BlockValue
 
 if TYPE_CHECKING:
     from typing import (
-        Any, Optional, Callable, Iterator, Iterable, Mapping, MutableMapping, ChainMap, Deque
+        Any, Optional, Callable, Iterator, Iterable, Sequence, Mapping, MutableMapping, Dict, List, Tuple
     )
     from stackscript.parser import ScriptSymbol
-    from stackscript.values import ScriptValue, BoolValue
+    from stackscript.values import ScriptValue
 
+    Executor = Callable[['ContextFrame', Any], None]
+    Instruction = Tuple[Optional[Executor], Any, ScriptSymbol]
 
 
+## Symbol Execution
+## Each symbol is compiled into an instruction once, by looking at the symbol's type:
+## (executor, argument, symbol). The exec loop calls executor(ctx, argument), or if the executor is None
+## the argument is a constant that is pushed directly onto the stack.
+## Blocks keep their instructions so that a block that is executed many times does not need to re-examine its symbols.
 
-_simple_literals: Mapping[LiteralType, Callable[[Any], ScriptValue]] = {
-    LiteralType.Bool    : BoolValue.get_value,
-    LiteralType.Integer : IntValue,
-    LiteralType.Float   : FloatValue,
-    LiteralType.String  : StringValue,
-    LiteralType.Block   : BlockValue,
-}
+def _exec_identifier(ctx: ContextFrame, sym: Identifier) -> None:
+    ctx._stack.append(ctx.eval_identifier(sym))
+
+def _exec_eval(ctx: ContextFrame, sym: ScriptSymbol) -> None:
+    ctx._stack.append(ctx.eval(sym))
+
+def _exec_new_array(ctx: ContextFrame, elements: Iterable[ScriptValue]) -> None:
+    ctx._stack.append(ArrayValue(elements))
+
+def _exec_compound(ctx: ContextFrame, arg: Tuple[Callable[[List[ScriptValue]], ScriptValue], Iterable[ScriptSymbol]]) -> None:
+    ctx._stack.append(_eval_compound(ctx, *arg))
 
-_compound_literals: Mapping[LiteralType, Callable[[Any], ScriptValue]] = {
-    LiteralType.Array : ArrayValue,
+def _eval_compound(ctx: ContextFrame, ctor: Callable[[List[ScriptValue]], ScriptValue], contents: Iterable[ScriptSymbol]) -> ScriptValue:
+    child_ctx = ctx.create_child(CtxFlags.ShareNamespace)
+    child_ctx.exec(contents)
+    return ctor(child_ctx._stack)  # the child frame is discarded, so its stack can be handed over
+
+# these are given the stack of the child frame that the contents were executed in
+_compound_literals: Mapping[LiteralType, Callable[[List[ScriptValue]], ScriptValue]] = {
+    LiteralType.Array : ArrayValue.from_list,
     LiteralType.Tuple : TupleValue,
 }
 
+def _compile_operator(sym: OperatorSym) -> Instruction:
+    return resolve_operator(sym.operator), sym.operator, sym
+
+def _compile_literal(sym: Literal) -> Instruction:
+    if sym.constant is not None:
+        return None, sym.constant, sym
+    if sym.type == LiteralType.Array and sym.elements is not None:
+        return _exec_new_array, sym.elements, sym
+
+    ctor = _compound_literals.get(sym.type)
+    if ctor is not None:
+        return _exec_compound, (ctor, sym.value), sym
+    return _exec_eval, sym, sym
+
+def _compile_identifier(sym: Identifier) -> Instruction:
+    return _exec_identifier, sym, sym
+
+# dispatch on the exact symbol type, same as the parser does for tokens
+_symbol_compilers: Mapping[type, Callable[[Any], Instruction]] = {
+    OperatorSym : _compile_operator,
+    Literal     : _compile_literal,
+    Identifier  : _compile_identifier,
+}
+
+def _compile_symbol(sym: ScriptSymbol) -> Instruction:
+    fcompile = _symbol_compilers.get(type(sym))
+    if fcompile is None:
+        return _exec_eval, sym, sym
+    return fcompile(sym)
+
+def _compile(prog: Iterable[ScriptSymbol]) -> Iterable[Instruction]:
+    if isinstance(prog, BlockValue):
+        if prog.code is None:
+            prog.code = tuple(map(_compile_symbol, prog))
+        return prog.code
+    return map(_compile_symbol, prog)
+
+# Flag operators run in Python and are slow for something done for every new frame,
+# so frames test their flags using the integer values instead.
+_SHARE_NAMESPACE = CtxFlags.ShareNamespace.value
+_SHARE_STACK = CtxFlags.ShareStack.value
+_BLOCK_ASSIGN_EXPR = CtxFlags.BlockAssignExpr.value
+
+_NO_FLAGS = CtxFlags(0)
+_SHARE_ALL = CtxFlags.ShareStack|CtxFlags.ShareNamespace
+
 class ContextFrame:
-    _stack: Deque[ScriptValue]  # index 0 is the TOP
-    _namespace: ChainMap[str, ScriptValue]
-    _block: Optional[Iterator[ScriptSymbol]] = None
-    def __init__(self, runtime: ScriptRuntime, parent: Optional[ContextFrame], flags: CtxFlags = CtxFlags(0)):
+    _stack: List[ScriptValue]  # the END of the list is the TOP
+    _namespace: Dict[str, ScriptValue]  # the names bound in this scope only
+    _enclosing: Optional[ContextFrame]   # where to look up names not found in this scope
+    _block: Optional[Iterator[Instruction]] = None
+    def __init__(self, runtime: ScriptRuntime, parent: Optional[ContextFrame], flags: CtxFlags = _NO_FLAGS):
         self.runtime = runtime
         self.parent = parent
         self.flags = flags
 
-        if self.flags & CtxFlags.ShareStack:
+        flag_bits = flags._value_
+        self._assign_expr = bool(flag_bits & _BLOCK_ASSIGN_EXPR)  # checked for every identifier
+
+        if flag_bits & _SHARE_STACK:
             self._stack = parent._stack
         else:
-            self._stack = deque()
+            self._stack = []
 
         if parent is None:
-            self._namespace = chainmap()
-        elif self.flags & CtxFlags.ShareNamespace:
+            self._namespace = {}
+            self._enclosing = None
+        elif flag_bits & _SHARE_NAMESPACE:
             self._namespace = parent._namespace
+            self._enclosing = parent._enclosing
         else:
-            self._namespace = parent._namespace.new_child()
+            self._namespace = {}
+            self._enclosing = parent
 
-    def create_child(self, flags: CtxFlags = CtxFlags(0)) -> ContextFrame:
+    def create_child(self, flags: CtxFlags = _NO_FLAGS) -> ContextFrame:
         """Create a new child frame from this one."""
         return ContextFrame(self.runtime, self, flags)
 
     def get_namespace(self) -> MutableMapping[str, ScriptValue]:
-        return self._namespace
+        if self._enclosing is None:
+            return self._namespace
+        scopes = []
+        ctx = self
+        while ctx is not None:
+            scopes.append(ctx._namespace)
+            ctx = ctx._enclosing
+        return chainmap(*scopes)
 
     def namespace_lookup(self, name: str) -> Optional[ScriptValue]:
-        return self._namespace.get(name)
+        ctx = self
+        while ctx is not None:
+            value = ctx._namespace.get(name)
+            if value is not None:
+                return value
+            ctx = ctx._enclosing
+        return None
 
     def namespace_bind_value(self, name: str, value: ScriptValue):
         self._namespace[name] = value
 
     def get_symbol_iter(self) -> Iterator[ScriptSymbol]:
-        return self._block
+        # draws from the same iterator as the exec loop, so any symbols taken here are skipped by it
+        return (sym for fexec, arg, sym in self._block)
 
     def exec(self, prog: Iterable[ScriptSymbol]) -> None:
         # HACK - temporary (hopefully!)
         if self._block is None:
             self._exec(prog)
         else:
-            sub_ctx = self.create_child(CtxFlags.ShareStack|CtxFlags.ShareNamespace)
+            sub_ctx = self.create_child(_SHARE_ALL)
             sub_ctx._exec(prog)
 
     def _exec(self, prog: Iterable[ScriptSymbol]) -> None:
         if self._block is not None:
             raise ValueError
 
-        self._block = iter(prog)
+        stack_append = self._stack.append  # same as push_stack()
+
+        self._block = iter(_compile(prog))
+        sym = None
         try:
-            for sym in self._block:
-                try:
-                    if isinstance(sym, OperatorSym):
-                        apply_operator(self, sym.operator)
-                    else:
-                        value = self.eval(sym)
-                        self.push_stack(value)
-
-                except ScriptError as err:
-                    if err.meta is None:
-                        err.meta = sym.meta
-                    if err.ctx is None:
-                        err.ctx = self
-                    raise
+            # the loop variable doubles as the current symbol if an error is raised
+            for fexec, arg, sym in self._block:
+                if fexec is None:
+                    stack_append(arg)
+                else:
+                    fexec(self, arg)
+
+        except ScriptError as err:
+            if err.meta is None and sym is not None:
+                err.meta = sym.meta
+            if err.ctx is None:
+                err.ctx = self
+            raise
         finally:
             self._block = None
 
     ## Symbol Evaluation
     def eval(self, sym: ScriptSymbol) -> ScriptValue:
         if isinstance(sym, Identifier):
-            # assignment context
-            if CtxFlags.BlockAssignExpr in self.flags:
-                return NameValue(self, sym.name)
-
-            value = self.namespace_lookup(sym.name)
-            if value is None:
-                raise ScriptNameError(f"could not resolve name '{sym.name}'", sym.name, meta=sym.meta)
-            return value
+            return self.eval_identifier(sym)
 
         if isinstance(sym, Literal):
-            # simple literals
-            ctor = _simple_literals.get(sym.type)
-            if ctor is not None:
-                return ctor(sym.value)
+            # simple literals, and anything else that was computed by the parser
+            if sym.constant is not None:
+                return sym.constant
 
             # compound literals
+            if sym.type == LiteralType.Array and sym.elements is not None:
+                return ArrayValue(sym.elements)
+
             ctor = _compound_literals.get(sym.type)
             if ctor is not None:
-                array_ctx = self.create_child(CtxFlags.ShareNamespace)
-                array_ctx.exec(sym.value)
-                return ctor(array_ctx.iter_stack_result())
+                return _eval_compound(self, ctor, sym.value)
 
         raise ValueError('cannot evaluate symbol', sym)
 
+    def eval_identifier(self, sym: Identifier) -> ScriptValue:
+        # assignment context
+        if self._assign_expr:
+            return NameValue(self, sym.name)
+
+        # same as namespace_lookup(), inlined
+        name = sym.name
+        ctx = self
+        while ctx is not None:
+            value = ctx._namespace.get(name)
+            if value is not None:
+                return value
+            ctx = ctx._enclosing
+        raise ScriptNameError(f"could not resolve name '{name}'", name, meta=sym.meta)
+
     ## Stack Operations
     ## TODO move these to EvalStack class?
+    ## Stack indices count down from the top, so idx 0 is the last item in the list.
     def push_stack(self, value: ScriptValue) -> None:
-        self._stack.appendleft(value)
+        self._stack.append(value)
 
     def pop_stack(self) -> ScriptValue:
-        if len(self._stack) == 0:
+        if not self._stack:
             raise ScriptError('stack is empty')
-        return self._stack.popleft()
+        return self._stack.pop()
+
+    def pop_stack_many(self, count: int) -> List[ScriptValue]:
+        """Pop the top count values, returned in stack order (the top value is last)."""
+        if count <= 0:
+            return []
+        if count > len(self._stack):
+            raise ScriptError('stack is empty')
+        values = self._stack[-count:]
+        del self._stack[-count:]
+        return values
 
     def iter_stack(self) -> Iterator[ScriptValue]:
         """Iterate starting from the top and moving down."""
-        return iter(self._stack)
+        return reversed(self._stack)
 
     def iter_stack_result(self) -> Iterator[ScriptValue]:
         """Iterate the stack contents as if copying results to another context."""
-        return reversed(self._stack)
+        return iter(self._stack)
 
     def peek_stack(self, idx: int = 0) -> ScriptValue:
-        return self._stack[idx]
+        return self._stack[-1-idx]
 
     def insert_stack(self, idx: int, value: ScriptValue) -> None:
-        self._stack.insert(idx, value)
+        self._stack.insert(len(self._stack) - idx, value)
 
     def remove_stack(self, idx: int) -> None:
-        del self._stack[idx]
+        del self._stack[-1-idx]
 
     def clear_stack(self) -> None:
         self._stack.clear()
@@ -200,18 +305,23 @@ class ScriptParser:
         self.runtime = runtime
         self._lexer = lexer
 
-    def parse(self, text: str) -> Iterator[ScriptSymbol]:
+    def parse(self, text: str) -> Sequence[ScriptSymbol]:
         self._text = text
         self._lexer.input(text)
         tokens = self._lexer.get_tokens()
         parser = Parser(tokens)
-        yield from parser.get_symbols()
+        return tuple(parser.get_symbols())
 
 class ScriptRuntime:
-    def __init__(self, lexer: Optional[Lexer] = None):
+    def __init__(self, lexer: Optional[Lexer] = None, *, parse_cache_size: int = 0):
         self._lexer = lexer or Lexer()
         self.root = ContextFrame(self, None)
 
+        # opt-in: strings that are evaluated repeatedly (e.g. inside a loop) are only parsed once,
+        # but scripts that never repeat an evaluated string would just pay for the extra hashing
+        if parse_cache_size > 0:
+            self._parse_block = lru_cache(maxsize=parse_cache_size)(self._parse_block)
+
     def create_parser(self) -> ScriptParser:
         return ScriptParser(self, self._lexer.clone())
 
@@ -224,9 +334,12 @@ class ScriptRuntime:
     def clear_stack(self) -> None:
         self.root.clear_stack()
 
-    def eval_script(self, text: str) -> Iterator[ScriptSymbol]:
+    def eval_script(self, text: str) -> BlockValue:
+        return self._parse_block(text)
+
+    def _parse_block(self, text: str) -> BlockValue:
         parser = self.create_parser()
-        return parser.parse(text)
+        return BlockValue(parser.parse(text))
 
     def run_script(self, text: str) -> None:
         parser = ScriptParser(self, self._lexer)
@@ -363,8 +476,8 @@ if __name__ == '__main__':
     ]
 
     from pprint import pprint
-    from operators.overloading import OP_REGISTRY
-    pprint(OP_REGISTRY)
+    from stackscript.operators.defines import Operator
+    pprint({ op : op._dispatch for op in Operator })
 
     for test in tests:
         print('>>>', test)
@@ -1,33 +1,31 @@
 from __future__ import annotations
 
-from functools import total_ordering
-from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, TypeVar, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, TypeVar
 
 from typing import Generic, Sequence, MutableSequence  # for generic type declaration
-from stackscript.parser import ScriptSymbol
 from stackscript.operators.defines import Operand
 from stackscript.exceptions import ScriptIndexError
 
 if TYPE_CHECKING:
-    from typing import Callable, Iterator, Iterable, ClassVar
-    from stackscript.runtime import ContextFrame
+    from typing import Callable, Iterator, Iterable, ClassVar, Optional, List
+    from stackscript.parser import ScriptSymbol
+    from stackscript.runtime import ContextFrame, Instruction
 
 
-class ScriptValue(ABC):
-    """Abstract base class of all data types."""
+## The value base classes are plain classes rather than ABCs or runtime checkable protocols,
+## since isinstance() is used on them all over the operator handlers and plain class checks are much faster.
 
-    @property
-    @abstractmethod
-    def optype(self) -> Operand: ...
+class ScriptValue:
+    """Base class of all data types."""
+    __slots__ = ()
 
-    @property
-    @abstractmethod
-    def tpname(self) -> str: ...
+    # every subclass must provide these
+    optype: ClassVar[Operand]
+    tpname: ClassVar[str]
 
-    @abstractmethod
     def format(self) -> str:
         """Format the ScriptValue in a way that produces valid script code which evalutes to the value."""
+        raise NotImplementedError
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__}({self.format()})>'
@@ -76,8 +74,8 @@ class DataValue(ScriptValue, Generic[_VT]):
 
     value: _VT
 
-    @abstractmethod
-    def __init__(self, value: _VT): ...
+    def __init__(self, value: _VT):
+        raise NotImplementedError
 
     def __hash__(self) -> int:
         return hash(self.value)
@@ -89,6 +87,8 @@ class DataValue(ScriptValue, Generic[_VT]):
 
 
 class BoolValue(DataValue[bool]):
+    __slots__ = ()
+
     TRUE: ClassVar[BoolValue]
     FALSE: ClassVar[BoolValue]
 
@@ -108,6 +108,8 @@ class BoolValue(DataValue[bool]):
     def __eq__(self, other: ScriptValue) -> bool:
         return self.value == bool(other)
 
+    __hash__ = DataValue.__hash__
+
     @classmethod
     def get_value(cls, b: bool) -> BoolValue:
         return BoolValue.TRUE if b else BoolValue.FALSE
@@ -116,24 +118,51 @@ BoolValue.TRUE  = BoolValue(True)
 BoolValue.FALSE = BoolValue(False)
 
 
-@total_ordering
 class IntValue(DataValue[int]):
+    __slots__ = '_fmt'
+
+    _small_ints: ClassVar[Sequence[IntValue]]
+
     tpname = 'int'
-    optype = Operand.Number
+    optype = Operand.Int
 
     value: int
     def __init__(self, value: float):
         self.value = int(value)
 
+    ## formatted text is memoized, _fmt is left unset until the first call
     def format(self) -> str:
-        return str(self.value)
+        try:
+            return self._fmt
+        except AttributeError:
+            self._fmt = fmt = str(self.value)
+            return fmt
 
     def __bool__(self) -> bool:
         return self.value != 0
 
+    ## explicit comparisons, these are hot enough that functools.total_ordering shims are noticeable
+    def __eq__(self, other: ScriptValue) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, DataValue):
+            return self.value == other.value
+        return False
+
+    __hash__ = DataValue.__hash__
+
     def __lt__(self, other: DataValue) -> bool:
         return self.value < other.value
 
+    def __le__(self, other: DataValue) -> bool:
+        return self.value <= other.value
+
+    def __gt__(self, other: DataValue) -> bool:
+        return self.value > other.value
+
+    def __ge__(self, other: DataValue) -> bool:
+        return self.value >= other.value
+
     def as_index(self) -> int:
         """convert from 1-indexing to 0-indexing."""
         if self.value < 0:
@@ -142,8 +171,21 @@ class IntValue(DataValue[int]):
             return self.value - 1
         raise ValueError('invalid index value')
 
-@total_ordering
+    @classmethod
+    def get_value(cls, value: float) -> IntValue:
+        """Like the constructor, but small integers are taken from a shared cache."""
+        value = int(value)
+        if value in _SMALL_INTS_RANGE:
+            return IntValue._small_ints[value - _SMALL_INTS_RANGE.start]
+        return IntValue(value)
+
+# similar to CPython's small int cache
+_SMALL_INTS_RANGE = range(-128, 257)
+IntValue._small_ints = tuple(IntValue(i) for i in _SMALL_INTS_RANGE)
+
 class FloatValue(DataValue[float]):
+    __slots__ = '_fmt'
+
     tpname = 'float'
     optype = Operand.Number
 
@@ -152,25 +194,59 @@ class FloatValue(DataValue[float]):
         self.value = float(value)
 
     def format(self) -> str:
-        return str(self.value)
+        try:
+            return self._fmt
+        except AttributeError:
+            self._fmt = fmt = str(self.value)
+            return fmt
 
     def __bool__(self) -> bool:
         return self.value != 0
 
+    def __eq__(self, other: ScriptValue) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, DataValue):
+            return self.value == other.value
+        return False
+
+    __hash__ = DataValue.__hash__
+
     def __lt__(self, other: DataValue) -> bool:
         return self.value < other.value
 
+    def __le__(self, other: DataValue) -> bool:
+        return self.value <= other.value
+
+    def __gt__(self, other: DataValue) -> bool:
+        return self.value > other.value
+
+    def __ge__(self, other: DataValue) -> bool:
+        return self.value >= other.value
+
+    @classmethod
+    def get_value(cls, value: float) -> FloatValue:
+        return FloatValue(value)
+
 ###### Sequences
 
-@runtime_checkable
-class SequenceValue(Protocol):
-    def __contains__(self, item: ScriptValue) -> bool: ...
+class SequenceValue:
+    __slots__ = ()
 
-    def __iter__(self) -> Iterator[ScriptValue]: ...
+    def __contains__(self, item: ScriptValue) -> bool:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[ScriptValue]:
+        raise NotImplementedError
 
-    def __getitem__(self, idx: IntValue) -> ScriptValue: ...
+    def __getitem__(self, idx: IntValue) -> ScriptValue:
+        raise NotImplementedError
 
 class StringValue(DataValue[str], SequenceValue):
+    __slots__ = '_fmt'
+
+    _ascii_chars: ClassVar[Sequence[StringValue]]
+
     tpname = 'string'
     optype = Operand.String
 
@@ -179,7 +255,11 @@ class StringValue(DataValue[str], SequenceValue):
         self.value = value
 
     def format(self) -> str:
-        return repr(self.value)
+        try:
+            return self._fmt
+        except AttributeError:
+            self._fmt = fmt = repr(self.value)
+            return fmt
 
     def __len__(self) -> int:
         return len(self.value)
@@ -190,20 +270,33 @@ class StringValue(DataValue[str], SequenceValue):
         return False
 
     def __iter__(self) -> Iterator[StringValue]:
+        get_char = StringValue.get_char
         for ch in self.value:
-            yield StringValue(ch)
+            yield get_char(ch)
 
     def __getitem__(self, idx: IntValue) -> StringValue:
         if idx.value == 0:
             raise ScriptIndexError('0 is not a valid index', idx, self)
         try:
-            return StringValue(self.value[idx.as_index()])
+            return StringValue.get_char(self.value[idx.as_index()])
         except IndexError:
             raise ScriptIndexError('index out of range', idx, self) from None
 
+    @classmethod
+    def get_char(cls, ch: str) -> StringValue:
+        """Get a single character string. ASCII characters are taken from a shared cache."""
+        c = ord(ch)
+        if c < 128:
+            return StringValue._ascii_chars[c]
+        return StringValue(ch)
+
+StringValue._ascii_chars = tuple(StringValue(chr(c)) for c in range(128))
+
 
 # similar to arrays, but immutable
 class TupleValue(DataValue[Sequence[ScriptValue]], SequenceValue):
+    __slots__ = ()
+
     tpname = 'tuple'
     optype = Operand.Array
 
@@ -211,8 +304,13 @@ class TupleValue(DataValue[Sequence[ScriptValue]], SequenceValue):
     def __init__(self, value: Iterable[ScriptValue]):
         self.value = tuple(value)
 
+    @classmethod
+    def from_list(cls, contents: List[ScriptValue]) -> TupleValue:
+        """Same as ArrayValue.from_list(), so that either type can be built from a freshly made list."""
+        return cls(contents)
+
     def format(self) -> str:
-        content = ' '.join(value.format() for value in self.value)
+        content = ' '.join([value.format() for value in self.value])
         return '(' + content + ')'
 
     def __len__(self) -> int:
@@ -242,8 +340,15 @@ class ArrayValue(ScriptValue, SequenceValue):
     def __init__(self, contents: Iterable[ScriptValue]):
         self._contents = list(contents)
 
+    @classmethod
+    def from_list(cls, contents: List[ScriptValue]) -> ArrayValue:
+        """Create an array that takes ownership of the given list instead of copying it."""
+        array = cls.__new__(cls)
+        array._contents = contents
+        return array
+
     def format(self) -> str:
-        content = ' '.join(value.format() for value in self._contents)
+        content = ' '.join([value.format() for value in self._contents])
         return '[' + content + ']'
 
     def __len__(self) -> int:
@@ -288,30 +393,53 @@ class ArrayValue(ScriptValue, SequenceValue):
 
 ###### Executable Values
 
-@runtime_checkable
-class CtxExecValue(Protocol):
-    def apply_exec(self, ctx: ContextFrame) -> None: ...
+class CtxExecValue:
+    __slots__ = ()
+
+    def apply_exec(self, ctx: ContextFrame) -> None:
+        raise NotImplementedError
+
+class BlockValue(DataValue[Sequence['ScriptSymbol']], CtxExecValue):
+    __slots__ = ('code', '_hash', '_fmt')
 
-class BlockValue(DataValue[Sequence[ScriptSymbol]], CtxExecValue):
     tpname = 'block'
     optype = Operand.Exec
 
     value: Sequence[ScriptSymbol]
+
+    # filled in by the runtime the first time the block is executed
+    code: Optional[Sequence[Instruction]]
+
     def __init__(self, value: Iterable[ScriptSymbol]):
         self.value = tuple(value)
+        self.code = None
 
     def format(self) -> str:
-        content = ' '.join(sym.meta.text for sym in self.value)
-        return '{ ' + content + ' }'
+        try:
+            return self._fmt
+        except AttributeError:
+            content = ' '.join([sym.meta.text for sym in self.value])
+            self._fmt = fmt = '{ ' + content + ' }'
+            return fmt
 
     def __iter__(self) -> Iterator[ScriptSymbol]:
         return iter(self.value)
 
+    # hashing a block hashes every symbol in it, the contents never change so only do it once
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = h = hash(self.value)
+            return h
+
     def apply_exec(self, ctx: ContextFrame) -> None:
         ctx.exec(self)
 
 
 class BuiltinValue(ScriptValue, CtxExecValue):
+    __slots__ = ('name', 'exec_func')
+
     tpname = 'builtin'
     optype = Operand.Exec
 
@@ -329,10 +457,14 @@ class BuiltinValue(ScriptValue, CtxExecValue):
 
 ###### Pseudo Data Values - these should only ever appear inside a block assignment context
 
-@runtime_checkable
-class BindingTarget(Protocol):
-    def bind_value(self, ctx: ContextFrame, value: ScriptValue) -> None: ...
-    def resolve_value(self) -> ScriptValue: ...
+class BindingTarget:
+    __slots__ = ()
+
+    def bind_value(self, ctx: ContextFrame, value: ScriptValue) -> None:
+        raise NotImplementedError
+
+    def resolve_value(self) -> ScriptValue:
+        raise NotImplementedError
 
 ## Pseudo data value
 ## WIP. Will be used to handle array/table assignment syntax, e.g:
@@ -344,6 +476,8 @@ class BindingTarget(Protocol):
 ## [2 42 4 5 6]
 ##
 class IndexValue(ScriptValue, BindingTarget):
+    __slots__ = ('array', 'index')
+
     tpname = '_index'
     optype = Operand.Name
 
@@ -364,6 +498,8 @@ class IndexValue(ScriptValue, BindingTarget):
 
 ## Another pseudo data value, also used for block assignment
 class NameValue(ScriptValue, BindingTarget):
+    __slots__ = ('ctx', 'name')
+
     tpname = '_name'
     optype = Operand.Name
 